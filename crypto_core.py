@@ -0,0 +1,137 @@
+import requests
+from requests.adapters import HTTPAdapter
+import orjson
+import heapq
+import hashlib
+from operator import itemgetter
+from datetime import datetime
+
+
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+REFRESH_INTERVAL = 300
+COIN_COUNT = 50
+
+# Shared by every CoinGecko client; the timeout keeps one stalled socket from hanging a long-running loop.
+HTTP_HEADERS = {"Accept-Encoding": "gzip", "User-Agent": "crypto-tracker/1.0"}
+REQUEST_TIMEOUT = 10
+
+# Processed coins are plain tuples in this column order.
+COLUMNS = ("Name", "Symbol", "Current Price (USD)", "Market Cap (USD)", "24h Trading Volume (USD)", "24h Price Change (%)")
+NAME, SYMBOL, PRICE, MARKET_CAP, VOLUME, CHANGE = range(len(COLUMNS))
+
+# API fields behind COLUMNS, fetched from each coin dict in a single C-level call.
+GET_FIELDS = itemgetter("name", "symbol", "current_price", "market_cap", "total_volume", "price_change_percentage_24h")
+
+# One keep-alive session for the life of the process so each cycle reuses the TLS connection.
+SESSION = requests.Session()
+SESSION.headers.update(HTTP_HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=2))
+
+# Last response body and its ETag, so an unchanged (304) response can be reused as is.
+_RESPONSE_CACHE = {"etag": None, "data": None}
+
+def fetch_top_50_cryptos():
+    """Fetch the top 50 cryptocurrencies by market capitalization from CoinGecko API."""
+    try:
+        endpoint = f"{COINGECKO_API_URL}/coins/markets"
+        params = {
+            "vs_currency": "usd",
+            "order": "market_cap_desc",
+            "per_page": COIN_COUNT,
+            "page": 1,
+            "sparkline": False,
+            "price_change_percentage": "24h"
+        }
+
+        headers = {}
+        if _RESPONSE_CACHE["etag"]:
+            headers["If-None-Match"] = _RESPONSE_CACHE["etag"]
+
+        response = SESSION.get(endpoint, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return _RESPONSE_CACHE["data"]
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        _RESPONSE_CACHE["etag"] = response.headers.get("ETag")
+        _RESPONSE_CACHE["data"] = data
+        return data
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        # A non-JSON body (rate-limit or proxy error page) is treated like a failed request: retry next cycle.
+        print(f"Error fetching data from CoinGecko API: {e}")
+        return None
+
+def process_crypto_data(data):
+    """Process the raw API response into COLUMNS and one tuple per coin."""
+    if not data:
+        return None
+
+    rows = []
+    for coin in data:
+        name, symbol, price, market_cap, volume, change = GET_FIELDS(coin)
+        # CoinGecko sends null for some fields; 0 is neutral for the market cap and volume totals.
+        rows.append((name, symbol.upper(), price, market_cap or 0, volume or 0, change or 0))
+
+    return COLUMNS, rows
+
+def data_digest(data):
+    """Return a short hash of the processed data, used to detect unchanged cycles."""
+    return hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16).digest()
+
+def analyze_crypto_data(data):
+    """Perform analysis on the processed cryptocurrency data."""
+    if not data:
+        return None
+
+    # One pass over the 50 coins; building a DataFrame costs more than the analysis itself.
+    columns, rows = data
+    total_market_cap = 0
+    total_trading_volume = 0
+    total_price = 0
+    priced = 0
+    highest = lowest = rows[0]
+    for coin in rows:
+        total_market_cap += coin[MARKET_CAP]
+        total_trading_volume += coin[VOLUME]
+        # A missing price is left out of the average rather than counted as 0.
+        if coin[PRICE] is not None:
+            total_price += coin[PRICE]
+            priced += 1
+        if coin[CHANGE] > highest[CHANGE]:
+            highest = coin
+        if coin[CHANGE] < lowest[CHANGE]:
+            lowest = coin
+
+    top_5 = heapq.nlargest(5, rows, key=itemgetter(MARKET_CAP))
+
+    analysis = {
+        "top_5_by_market_cap": [
+            {"Name": coin[NAME], "Symbol": coin[SYMBOL], "Market Cap (USD)": coin[MARKET_CAP]}
+            for coin in top_5
+        ],
+        "average_price": total_price / priced if priced else 0,
+        "highest_price_change": dict(zip(columns, highest)),
+        "lowest_price_change": dict(zip(columns, lowest)),
+        "total_market_cap": total_market_cap,
+        "total_trading_volume": total_trading_volume,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+    return analysis
+
+def next_tick(next_run, now):
+    """Return (next_run, delay) for the cycle after the one scheduled at next_run."""
+    # Sleep to the next scheduled tick rather than a fixed interval, so cycle time doesn't accumulate as drift;
+    # a cycle that overran its slot starts the schedule again from now.
+    next_run += REFRESH_INTERVAL
+    delay = next_run - now
+    if delay > 0:
+        return next_run, delay
+    return now, 0
+
+def fetch_and_analyze():
+    """Return (processed_data, analysis) for a fresh fetch, or None if the fetch failed."""
+    processed_data = process_crypto_data(fetch_top_50_cryptos())
+    if not processed_data:
+        return None
+    return processed_data, analyze_crypto_data(processed_data)
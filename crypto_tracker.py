@@ -1,133 +1,80 @@
-import requests
-import pandas as pd
-import time
+import asyncio
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill
 from datetime import datetime
 import os
 
+from crypto_core import REFRESH_INTERVAL, data_digest, fetch_and_analyze, next_tick
+
 
-COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
 EXCEL_FILE_PATH = "crypto_data_live.xlsx"
-REFRESH_INTERVAL = 300  
 
-def fetch_top_50_cryptos():
-    try:
-        endpoint = f"{COINGECKO_API_URL}/coins/markets"
-        params = {
-            "vs_currency": "usd",
-            "order": "market_cap_desc",
-            "per_page": 50,
-            "page": 1,
-            "sparkline": False,
-            "price_change_percentage": "24h"
-        }
-        
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()  
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data from CoinGecko API: {e}")
-        return None
-
-def process_crypto_data(data):
-    if not data:
-        return None
-    
-    processed_data = []
-    for coin in data:
-        processed_data.append({
-            "name": coin["name"],
-            "symbol": coin["symbol"].upper(),
-            "current_price": coin["current_price"],
-            "market_cap": coin["market_cap"],
-            "trading_volume_24h": coin["total_volume"],
-            "price_change_24h": coin["price_change_percentage_24h"] if coin["price_change_percentage_24h"] else 0
-        })
-    
-    return processed_data
-
-def analyze_crypto_data(data):
-    if not data:
-        return None
-    
-    df = pd.DataFrame(data)
-    
-    analysis = {
-        "top_5_by_market_cap": df.nlargest(5, "market_cap")[["name", "symbol", "market_cap"]].to_dict("records"),
-        "average_price": df["current_price"].mean(),
-        "highest_price_change": df.loc[df["price_change_24h"].idxmax()],
-        "lowest_price_change": df.loc[df["price_change_24h"].idxmin()],
-        "total_market_cap": df["market_cap"].sum(),
-        "total_trading_volume": df["trading_volume_24h"].sum(),
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    return analysis
+# Styles are immutable once assigned, so the same Font objects are shared by every update.
+TITLE_FONT = Font(bold=True, size=14)
+SECTION_FONT = Font(bold=True)
+COL_LETTERS = tuple(openpyxl.utils.get_column_letter(i) for i in range(1, 33))
+
+# Fixed layout of the Analysis sheet, built once instead of on every update.
+ANALYSIS_MERGES = ('A1:D1', 'A6:D6', 'A13:D13')
+SUMMARY_HEADER = ("Timestamp", "Average Price (USD)", "Total Market Cap (USD)", "Total 24h Trading Volume (USD)")
+TOP5_HEADER = ("Name", "Symbol", "Market Cap (USD)")
+EXTREMES_HEADER = ("Type", "Name", "Symbol", "Price Change (%)")
+
+def _styled_cell(worksheet, value, font):
+    """Create a write-only cell carrying a font."""
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.font = font
+    return cell
 
 def update_excel(data, analysis):
     """Update the Excel file with cryptocurrency data and analysis."""
     if not data:
         return False
     
-    df = pd.DataFrame(data)
+    columns, rows = data
     
+    # Write-only mode streams rows straight into the xlsx instead of building a cell tree.
+    workbook = openpyxl.Workbook(write_only=True)
     
-    with pd.ExcelWriter(EXCEL_FILE_PATH, engine='openpyxl') as writer:
-   
-        df.to_excel(writer, sheet_name='Live Crypto Data', index=False)
-        
-        
-        analysis_df = pd.DataFrame([{
-            "Timestamp": analysis["timestamp"],
-            "Average Price (USD)": analysis["average_price"],
-            "Total Market Cap (USD)": analysis["total_market_cap"],
-            "Total 24h Trading Volume (USD)": analysis["total_trading_volume"]
-        }])
-        analysis_df.to_excel(writer, sheet_name='Analysis', index=False, startrow=1)
-        
-        
-        top5_df = pd.DataFrame(analysis["top_5_by_market_cap"])
-        top5_df.to_excel(writer, sheet_name='Analysis', index=False, startrow=6)
-        
-        
-        price_changes = pd.DataFrame([
-            {
-                "Type": "Highest 24h Price Change",
-                "Name": analysis["highest_price_change"]["name"],
-                "Symbol": analysis["highest_price_change"]["symbol"],
-                "Price Change (%)": analysis["highest_price_change"]["price_change_24h"]
-            },
-            {
-                "Type": "Lowest 24h Price Change",
-                "Name": analysis["lowest_price_change"]["name"],
-                "Symbol": analysis["lowest_price_change"]["symbol"],
-                "Price Change (%)": analysis["lowest_price_change"]["price_change_24h"]
-            }
-        ])
-        price_changes.to_excel(writer, sheet_name='Analysis', index=False, startrow=13)
-        
-        
-        workbook = writer.book
-        
-        
-        worksheet = writer.sheets['Live Crypto Data']
-        for col in range(1, len(df.columns) + 1):
-            worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 20
-        
-        
-        analysis_sheet = writer.sheets['Analysis']
-        analysis_sheet.merge_cells('A1:D1')
-        analysis_sheet.cell(1, 1).value = "Cryptocurrency Market Analysis"
-        analysis_sheet.cell(1, 1).font = Font(bold=True, size=14)
-        
-        analysis_sheet.merge_cells('A6:D6')
-        analysis_sheet.cell(6, 1).value = "Top 5 Cryptocurrencies by Market Cap"
-        analysis_sheet.cell(6, 1).font = Font(bold=True)
-        
-        analysis_sheet.merge_cells('A13:D13')
-        analysis_sheet.cell(13, 1).value = "24-Hour Price Change Extremes"
-        analysis_sheet.cell(13, 1).font = Font(bold=True)
+    
+    worksheet = workbook.create_sheet('Live Crypto Data')
+    for letter in COL_LETTERS[:len(columns)]:
+        worksheet.column_dimensions[letter].width = 20
+    worksheet.append(columns)
+    for row in rows:
+        worksheet.append(row)
+    
+    
+    analysis_sheet = workbook.create_sheet('Analysis')
+    for cell_range in ANALYSIS_MERGES:
+        analysis_sheet.merged_cells.add(cell_range)
+    
+    analysis_sheet.append([_styled_cell(analysis_sheet, "Cryptocurrency Market Analysis", TITLE_FONT)])
+    analysis_sheet.append(SUMMARY_HEADER)
+    analysis_sheet.append([
+        analysis["timestamp"],
+        analysis["average_price"],
+        analysis["total_market_cap"],
+        analysis["total_trading_volume"]
+    ])
+    analysis_sheet.append([])
+    analysis_sheet.append([])
+    
+    
+    analysis_sheet.append([_styled_cell(analysis_sheet, "Top 5 Cryptocurrencies by Market Cap", SECTION_FONT)])
+    analysis_sheet.append(TOP5_HEADER)
+    for coin in analysis["top_5_by_market_cap"]:
+        analysis_sheet.append([coin["Name"], coin["Symbol"], coin["Market Cap (USD)"]])
+    
+    
+    analysis_sheet.append([_styled_cell(analysis_sheet, "24-Hour Price Change Extremes", SECTION_FONT)])
+    analysis_sheet.append(EXTREMES_HEADER)
+    for label, coin in (("Highest 24h Price Change", analysis["highest_price_change"]),
+                        ("Lowest 24h Price Change", analysis["lowest_price_change"])):
+        analysis_sheet.append([label, coin["Name"], coin["Symbol"], coin["24h Price Change (%)"]])
+    
+    workbook.save(EXCEL_FILE_PATH)
     
     print(f"Excel file updated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     return True
@@ -139,71 +86,104 @@ def generate_analysis_report(data, analysis):
     
     report_file = "crypto_analysis_report.txt"
     
+    highest = analysis["highest_price_change"]
+    lowest = analysis["lowest_price_change"]
+    top_5 = "\n".join(
+        f"{i}. {coin['Name']} ({coin['Symbol']}): ${coin['Market Cap (USD)']:,.2f}"
+        for i, coin in enumerate(analysis["top_5_by_market_cap"], 1)
+    )
+    
+    # Build the whole report first so it is written in a single call.
+    report = f"""CRYPTOCURRENCY MARKET ANALYSIS REPORT
+====================================
+
+Generated on: {analysis['timestamp']}
+
+MARKET OVERVIEW
+--------------
+Total Market Cap of Top 50: ${analysis['total_market_cap']:,.2f}
+Total 24h Trading Volume: ${analysis['total_trading_volume']:,.2f}
+Average Price of Top 50: ${analysis['average_price']:,.2f}
+
+TOP 5 CRYPTOCURRENCIES BY MARKET CAP
+-----------------------------------
+{top_5}
+
+24-HOUR PRICE CHANGE EXTREMES
+----------------------------
+Highest: {highest['Name']} ({highest['Symbol']}): {highest['24h Price Change (%)']:.2f}%
+Lowest: {lowest['Name']} ({lowest['Symbol']}): {lowest['24h Price Change (%)']:.2f}%
+
+NOTE: For more detailed information and live updates, please refer to the Excel file.
+"""
+    
     with open(report_file, "w") as f:
-        f.write("CRYPTOCURRENCY MARKET ANALYSIS REPORT\n")
-        f.write("====================================\n\n")
-        f.write(f"Generated on: {analysis['timestamp']}\n\n")
-        
-        f.write("MARKET OVERVIEW\n")
-        f.write("--------------\n")
-        f.write(f"Total Market Cap of Top 50: ${analysis['total_market_cap']:,.2f}\n")
-        f.write(f"Total 24h Trading Volume: ${analysis['total_trading_volume']:,.2f}\n")
-        f.write(f"Average Price of Top 50: ${analysis['average_price']:,.2f}\n\n")
-        
-        f.write("TOP 5 CRYPTOCURRENCIES BY MARKET CAP\n")
-        f.write("-----------------------------------\n")
-        for i, coin in enumerate(analysis['top_5_by_market_cap'], 1):
-            f.write(f"{i}. {coin['name']} ({coin['symbol']}): ${coin['market_cap']:,.2f}\n")
-        f.write("\n")
-        
-        f.write("24-HOUR PRICE CHANGE EXTREMES\n")
-        f.write("----------------------------\n")
-        f.write(f"Highest: {analysis['highest_price_change']['name']} ({analysis['highest_price_change']['symbol']}): {analysis['highest_price_change']['price_change_24h']:.2f}%\n")
-        f.write(f"Lowest: {analysis['lowest_price_change']['name']} ({analysis['lowest_price_change']['symbol']}): {analysis['lowest_price_change']['price_change_24h']:.2f}%\n\n")
-        
-        f.write("NOTE: For more detailed information and live updates, please refer to the Excel file.\n")
+        f.write(report)
     
     print(f"Analysis report generated at {report_file}")
     return True
 
-def main():
-    """Main function to run the cryptocurrency tracker."""
-    print("Cryptocurrency Live Tracker Started")
-    print("==================================")
-    print("Fetching and analyzing top 50 cryptocurrencies...")
-    print("Press Ctrl+C to stop the program.")
-    
+async def main_async():
+    """Refresh loop: fetch and analyze each cycle while Excel writes run in a worker thread."""
     run_count = 0
+    last_digest = None
+    write_lock = asyncio.Semaphore(1)
+    pending_writes = set()
+    loop = asyncio.get_running_loop()
+    next_run = loop.time()
     
-    try:
-        while True:
-            run_count += 1
-            print(f"\nUpdate #{run_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    async def write_excel(processed_data, analysis_results):
+        nonlocal last_digest
+        # The semaphore keeps a slow write from overlapping the next cycle's write.
+        async with write_lock:
+            try:
+                await asyncio.to_thread(update_excel, processed_data, analysis_results)
+            except Exception as e:
+                print(f"Error updating Excel file: {e}")
+                last_digest = None
+    
+    while True:
+        run_count += 1
+        print(f"\nUpdate #{run_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        
+        result = await asyncio.to_thread(fetch_and_analyze)
+        
+        if result:
             
+            processed_data, analysis_results = result
             
-            crypto_data = fetch_top_50_cryptos()
             
-            if crypto_data:
-                
-                processed_data = process_crypto_data(crypto_data)
-                
-               
-                analysis_results = analyze_crypto_data(processed_data)
-                
-               
-                update_excel(processed_data, analysis_results)
+            digest = data_digest(processed_data)
+            if digest == last_digest:
+                print(f"Data unchanged, skipping Excel write. Next update in {REFRESH_INTERVAL // 60} minutes.")
+            else:
+                last_digest = digest
+                task = asyncio.create_task(write_excel(processed_data, analysis_results))
+                pending_writes.add(task)
+                task.add_done_callback(pending_writes.discard)
                 
                 
                 if run_count == 1:
                     generate_analysis_report(processed_data, analysis_results)
                 
-                print(f"Data updated successfully. Next update in {REFRESH_INTERVAL // 60} minutes.")
-            else:
-                print("Failed to fetch data. Will retry in the next cycle.")
-            
-           
-            time.sleep(REFRESH_INTERVAL)
-            
+                print(f"Data processed, Excel update running. Next update in {REFRESH_INTERVAL // 60} minutes.")
+        else:
+            print("Failed to fetch data. Will retry in the next cycle.")
+        
+        
+        next_run, delay = next_tick(next_run, loop.time())
+        await asyncio.sleep(delay)
+
+def main():
+    """Main function to run the cryptocurrency tracker."""
+    print("Cryptocurrency Live Tracker Started")
+    print("==================================")
+    print("Fetching and analyzing top 50 cryptocurrencies...")
+    print("Press Ctrl+C to stop the program.")
+    
+    try:
+        asyncio.run(main_async())
     except KeyboardInterrupt:
         print("\nProgram terminated by user.")
     except Exception as e:
@@ -1,75 +1,27 @@
-import requests
-import pandas as pd
+import openpyxl
 import time
 import os
+import atexit
 from datetime import datetime
 import win32com.client
+import win32com.client.gencache
 import pythoncom
 import sys
 
+from crypto_core import COIN_COUNT, COLUMNS, REFRESH_INTERVAL, data_digest, fetch_and_analyze, next_tick
 
-COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
-EXCEL_FILE_PATH = os.path.abspath("crypto_data_live.xlsx")
-REFRESH_INTERVAL = 300  
 
-def fetch_top_50_cryptos():
-    """Fetch the top 50 cryptocurrencies by market capitalization from CoinGecko API."""
-    try:
-        endpoint = f"{COINGECKO_API_URL}/coins/markets"
-        params = {
-            "vs_currency": "usd",
-            "order": "market_cap_desc",
-            "per_page": 50,
-            "page": 1,
-            "sparkline": False,
-            "price_change_percentage": "24h"
-        }
-        
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()  
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data from CoinGecko API: {e}")
-        return None
+EXCEL_FILE_PATH = os.path.abspath("crypto_data_live.xlsx")
+# Header row plus one row per fetched coin, so the cleared block always matches what a fetch returns.
+CLEAR_RANGE = f"A2:F{COIN_COUNT + 1}"
+DATA_RANGE = f"A1:F{COIN_COUNT + 1}"
+XL_CALCULATION_MANUAL = -4135
 
-def process_crypto_data(data):
-    """Process and transform the raw cryptocurrency data."""
-    if not data:
-        return None
-    
-    
-    processed_data = []
-    for coin in data:
-        processed_data.append({
-            "Name": coin["name"],
-            "Symbol": coin["symbol"].upper(),
-            "Current Price (USD)": coin["current_price"],
-            "Market Cap (USD)": coin["market_cap"],
-            "24h Trading Volume (USD)": coin["total_volume"],
-            "24h Price Change (%)": coin["price_change_percentage_24h"] if coin["price_change_percentage_24h"] else 0
-        })
-    
-    return processed_data
+# AutoFit is one of the slowest COM calls; column widths persist in the file, so fit them once.
+_columns_fitted = False
 
-def analyze_crypto_data(data):
-    """Perform analysis on the cryptocurrency data."""
-    if not data:
-        return None
-    
-    df = pd.DataFrame(data)
-    
-    # Analysis results
-    analysis = {
-        "top_5_by_market_cap": df.nlargest(5, "Market Cap (USD)")[["Name", "Symbol", "Market Cap (USD)"]].to_dict("records"),
-        "average_price": df["Current Price (USD)"].mean(),
-        "highest_price_change": df.loc[df["24h Price Change (%)"].idxmax()],
-        "lowest_price_change": df.loc[df["24h Price Change (%)"].idxmin()],
-        "total_market_cap": df["Market Cap (USD)"].sum(),
-        "total_trading_volume": df["24h Trading Volume (USD)"].sum(),
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    return analysis
+# Excel instance, workbook and sheets, held for the life of the process instead of reopened every cycle.
+_EXCEL_STATE = {}
 
 def create_excel_template():
     """Create the initial Excel template if it doesn't exist."""
@@ -77,34 +29,26 @@ def create_excel_template():
         return
     
     
-    columns = [
-        "Name", "Symbol", "Current Price (USD)", 
-        "Market Cap (USD)", "24h Trading Volume (USD)", 
-        "24h Price Change (%)"
-    ]
-    df = pd.DataFrame(columns=columns)
-    
-    with pd.ExcelWriter(EXCEL_FILE_PATH, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Live Crypto Data', index=False)
-        analysis_df = pd.DataFrame(columns=["Metric", "Value"])
-        analysis_df.to_excel(writer, sheet_name='Analysis', index=False)
+    # Write-only workbook: header rows are streamed out without a DataFrame or cell tree.
+    wb = openpyxl.Workbook(write_only=True)
+    wb.create_sheet('Live Crypto Data').append(COLUMNS)
+    wb.create_sheet('Analysis').append(("Metric", "Value"))
+    wb.save(EXCEL_FILE_PATH)
     
     print(f"Created Excel template at {EXCEL_FILE_PATH}")
 
-def update_excel_with_com(data, analysis):
-    
-    if not data or not analysis:
-        return False
+def _get_excel_state():
+    """Start Excel and open the workbook on first use; later calls reuse them."""
+    if _EXCEL_STATE:
+        return _EXCEL_STATE
     
+    pythoncom.CoInitialize()
+    excel = None
     try:
-        
-        pythoncom.CoInitialize()
-        df = pd.DataFrame(data)
-        
-        excel = win32com.client.Dispatch("Excel.Application")
+        # Early-bound wrapper from the gencache: calls go straight to Invoke with known DISPIDs.
+        excel = win32com.client.gencache.EnsureDispatch("Excel.Application")
         excel.Visible = True  
         
-
         try:
             wb = excel.Workbooks(os.path.basename(EXCEL_FILE_PATH))
             print("Excel file is already open, updating...")
@@ -115,28 +59,101 @@ def update_excel_with_com(data, analysis):
             wb = excel.Workbooks.Open(EXCEL_FILE_PATH)
             print("Opened Excel file for updating...")
         
+        _EXCEL_STATE.update({
+            "app": excel,
+            "wb": wb,
+            "ws_data": wb.Sheets("Live Crypto Data"),
+            "ws_analysis": wb.Sheets("Analysis")
+        })
+    except:
+        # Don't leave a half-started instance or an unbalanced CoInitialize behind for the next attempt.
+        _EXCEL_STATE.clear()
+        if excel is not None:
+            try:
+                excel.Quit()
+            except:
+                pass
+        pythoncom.CoUninitialize()
+        raise
+    return _EXCEL_STATE
+
+def _workbook_alive():
+    """Return True if the held workbook still answers COM calls."""
+    try:
+        _EXCEL_STATE["wb"].Name
+        return True
+    except:
+        return False
+
+def _teardown():
+    """Quit the held Excel instance and release its COM initialization."""
+    if not _EXCEL_STATE:
+        return
+    
+    # Drop the workbook and sheet proxies first, and the Application proxy after Quit, so nothing
+    # still references Excel once COM is uninitialized.
+    excel = _EXCEL_STATE["app"]
+    _EXCEL_STATE.clear()
+    try:
+        excel.Quit()
+    except:
+        pass
+    excel = None
+    pythoncom.CoUninitialize()
+
+atexit.register(_teardown)
+
+def update_excel_with_com(data, analysis, data_changed=True):
+    global _columns_fitted
+    
+    if not data or not analysis:
+        return False
+    
+    excel = None
+    prev_settings = {}
+    prev_calc = None
+    try:
+        
+        columns, rows = data
+        
+        state = _get_excel_state()
+        excel = state["app"]
+        wb = state["wb"]
+        ws_data = state["ws_data"]
+        ws_analysis = state["ws_analysis"]
+        
+        # Excel is shared and visible: remember the user's settings so they are restored, not forced on.
+        for setting in ("DisplayAlerts", "ScreenUpdating", "EnableEvents"):
+            prev_settings[setting] = getattr(excel, setting)
+            setattr(excel, setting, False)
         
-        ws_data = wb.Sheets("Live Crypto Data")
+        # Batch all writes: no recalculation until the update is done.
+        prev_calc = excel.Calculation
+        excel.Calculation = XL_CALCULATION_MANUAL
         
         
-        if ws_data.UsedRange.Rows.Count > 1:
-            ws_data.Range(f"A2:F{ws_data.UsedRange.Rows.Count}").Clear()
+        if not data_changed:
+            # Market data is the same as last cycle: only the two "Last Updated" cells need refreshing.
+            ws_data.Cells(1, 9).Value = analysis["timestamp"]
+            ws_analysis.Cells(7, 2).Value = analysis["timestamp"]
+            excel.Calculation = prev_calc
+            wb.Save()
+            print(f"Data unchanged, refreshed timestamp at {analysis['timestamp']}")
+            return True
         
         
-        for r, row in enumerate(df.values, start=2):
-            for c, value in enumerate(row, start=1):
-                ws_data.Cells(r, c).Value = value
+        ws_data.Range(CLEAR_RANGE).ClearContents()
         
         
-        data_range = ws_data.Range(f"A1:F{len(df) + 1}")
-        data_range.Columns.AutoFit()
+        # COM takes a sequence of row tuples of native values; one Range assignment replaces a call per cell.
+        ws_data.Range(ws_data.Cells(2, 1), ws_data.Cells(1 + len(rows), len(columns))).Value = rows
         
         
-        ws_data.Cells(1, 8).Value = "Last Updated:"
-        ws_data.Cells(1, 9).Value = analysis["timestamp"]
+        if not _columns_fitted:
+            ws_data.Range(DATA_RANGE).Columns.AutoFit()
         
         
-        ws_analysis = wb.Sheets("Analysis")
+        ws_data.Range("H1:I1").Value = [["Last Updated:", analysis["timestamp"]]]
         
         
         ws_analysis.UsedRange.Clear()
@@ -150,80 +167,79 @@ def update_excel_with_com(data, analysis):
         
         
         ws_analysis.Cells(3, 1).Value = "Summary Metrics"
-        ws_analysis.Range("A3:B3").Merge()
-        ws_analysis.Range("A3:B3").Font.Bold = True
+        section_range = ws_analysis.Range("A3:B3")
+        section_range.Merge()
+        section_range.Font.Bold = True
         
-        ws_analysis.Cells(4, 1).Value = "Average Price (USD)"
-        ws_analysis.Cells(4, 2).Value = analysis["average_price"]
-        
-        ws_analysis.Cells(5, 1).Value = "Total Market Cap (USD)"
-        ws_analysis.Cells(5, 2).Value = analysis["total_market_cap"]
-        
-        ws_analysis.Cells(6, 1).Value = "Total 24h Trading Volume (USD)"
-        ws_analysis.Cells(6, 2).Value = analysis["total_trading_volume"]
-        
-        ws_analysis.Cells(7, 1).Value = "Last Updated"
-        ws_analysis.Cells(7, 2).Value = analysis["timestamp"]
+        ws_analysis.Range("A4:B7").Value = [
+            ["Average Price (USD)", float(analysis["average_price"])],
+            ["Total Market Cap (USD)", float(analysis["total_market_cap"])],
+            ["Total 24h Trading Volume (USD)", float(analysis["total_trading_volume"])],
+            ["Last Updated", analysis["timestamp"]]
+        ]
         
         
         ws_analysis.Cells(9, 1).Value = "Top 5 Cryptocurrencies by Market Cap"
-        ws_analysis.Range("A9:D9").Merge()
-        ws_analysis.Range("A9:D9").Font.Bold = True
+        section_range = ws_analysis.Range("A9:D9")
+        section_range.Merge()
+        section_range.Font.Bold = True
         
-        ws_analysis.Cells(10, 1).Value = "Rank"
-        ws_analysis.Cells(10, 2).Value = "Name"
-        ws_analysis.Cells(10, 3).Value = "Symbol"
-        ws_analysis.Cells(10, 4).Value = "Market Cap (USD)"
-        
-        for i, coin in enumerate(analysis["top_5_by_market_cap"], 1):
-            ws_analysis.Cells(10 + i, 1).Value = i
-            ws_analysis.Cells(10 + i, 2).Value = coin["Name"]
-            ws_analysis.Cells(10 + i, 3).Value = coin["Symbol"]
-            ws_analysis.Cells(10 + i, 4).Value = coin["Market Cap (USD)"]
+        top5 = [["Rank", "Name", "Symbol", "Market Cap (USD)"]]
+        top5 += [
+            [i, coin["Name"], coin["Symbol"], float(coin["Market Cap (USD)"])]
+            for i, coin in enumerate(analysis["top_5_by_market_cap"], 1)
+        ]
+        ws_analysis.Range(ws_analysis.Cells(10, 1), ws_analysis.Cells(9 + len(top5), 4)).Value = top5
         
         
         ws_analysis.Cells(17, 1).Value = "24-Hour Price Change Extremes"
-        ws_analysis.Range("A17:D17").Merge()
-        ws_analysis.Range("A17:D17").Font.Bold = True
-        
-        ws_analysis.Cells(18, 1).Value = "Type"
-        ws_analysis.Cells(18, 2).Value = "Name"
-        ws_analysis.Cells(18, 3).Value = "Symbol"
-        ws_analysis.Cells(18, 4).Value = "Price Change (%)"
-        
+        section_range = ws_analysis.Range("A17:D17")
+        section_range.Merge()
+        section_range.Font.Bold = True
         
-        ws_analysis.Cells(19, 1).Value = "Highest"
-        ws_analysis.Cells(19, 2).Value = analysis["highest_price_change"]["Name"]
-        ws_analysis.Cells(19, 3).Value = analysis["highest_price_change"]["Symbol"]
-        ws_analysis.Cells(19, 4).Value = analysis["highest_price_change"]["24h Price Change (%)"]
+        highest = analysis["highest_price_change"]
+        lowest = analysis["lowest_price_change"]
+        ws_analysis.Range("A18:D20").Value = [
+            ["Type", "Name", "Symbol", "Price Change (%)"],
+            ["Highest", highest["Name"], highest["Symbol"], float(highest["24h Price Change (%)"])],
+            ["Lowest", lowest["Name"], lowest["Symbol"], float(lowest["24h Price Change (%)"])]
+        ]
         
         
-        ws_analysis.Cells(20, 1).Value = "Lowest"
-        ws_analysis.Cells(20, 2).Value = analysis["lowest_price_change"]["Name"]
-        ws_analysis.Cells(20, 3).Value = analysis["lowest_price_change"]["Symbol"]
-        ws_analysis.Cells(20, 4).Value = analysis["lowest_price_change"]["24h Price Change (%)"]
-        
-        
-        ws_analysis.Columns.AutoFit()
+        if not _columns_fitted:
+            ws_analysis.Columns.AutoFit()
         
         
+        # Restore before saving so the workbook isn't stored in manual mode.
+        excel.Calculation = prev_calc
         wb.Save()
+        _columns_fitted = True
         print(f"Excel file updated at {analysis['timestamp']}")
         
         return True
     
     except Exception as e:
         print(f"Error updating Excel: {e}")
+        # Transient errors (e.g. the user is editing a cell) keep the instance for the next cycle.
+        # Only a dead workbook is released, and Excel is quit first so no orphaned instance holds the file.
+        if _EXCEL_STATE and not _workbook_alive():
+            # Release this frame's proxies before teardown; excel = None also skips the restore below.
+            excel = wb = ws_data = ws_analysis = state = None
+            _teardown()
         return False
     finally:
         
-        try:
-            wb = None
-            excel.Quit()
-            excel = None
-            pythoncom.CoUninitialize()
-        except:
-            pass
+        if excel is not None:
+            if prev_calc is not None:
+                try:
+                    excel.Calculation = prev_calc
+                except:
+                    pass
+            for setting, value in prev_settings.items():
+                try:
+                    setattr(excel, setting, value)
+                except:
+                    pass
 
 def main():
     """Main function to run the cryptocurrency tracker with live Excel updates."""
@@ -239,6 +255,8 @@ def main():
         create_excel_template()
     
     run_count = 0
+    last_digest = None
+    next_run = time.monotonic()
     
     try:
         while True:
@@ -246,19 +264,18 @@ def main():
             print(f"\nUpdate #{run_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             
-            crypto_data = fetch_top_50_cryptos()
+            result = fetch_and_analyze()
             
-            if crypto_data:
-                
-                processed_data = process_crypto_data(crypto_data)
-                
+            if result:
                 
-                analysis_results = analyze_crypto_data(processed_data)
+                processed_data, analysis_results = result
                 
                 
-                success = update_excel_with_com(processed_data, analysis_results)
+                digest = data_digest(processed_data)
+                success = update_excel_with_com(processed_data, analysis_results, data_changed=digest != last_digest)
                 
                 if success:
+                    last_digest = digest
                     print(f"Excel updated successfully. Next update in {REFRESH_INTERVAL // 60} minutes.")
                 else:
                     print("Failed to update Excel. Will retry in the next cycle.")
@@ -266,7 +283,8 @@ def main():
                 print("Failed to fetch data. Will retry in the next cycle.")
             
             
-            time.sleep(REFRESH_INTERVAL)
+            next_run, delay = next_tick(next_run, time.monotonic())
+            time.sleep(delay)
             
     except KeyboardInterrupt:
         print("\nProgram terminated by user.")
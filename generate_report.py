@@ -1,194 +1,251 @@
-import requests
-import pandas as pd
+import asyncio
+import aiohttp
+from aiohttp_client_cache import CachedSession, SQLiteBackend
 from datetime import datetime
 import os
-import matplotlib.pyplot as plt
+import hashlib
+from functools import lru_cache
 import numpy as np
-import base64
+import orjson
+import pybase64
 from io import BytesIO
+from itertools import count
+from PIL import Image
+
+from crypto_core import HTTP_HEADERS, REQUEST_TIMEOUT
 
 
 COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
 REPORT_FILE_PATH = "Crypto_Analysis_Report.html"
 
-def fetch_top_50_cryptos():
-    """Fetch the top 50 cryptocurrencies by market capitalization from CoinGecko API."""
+# Responses are cached on disk for a short window so repeat runs skip the network entirely.
+HTTP_CACHE_NAME = "coingecko_cache"
+HTTP_CACHE_TTL = 120
+
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+# 72 DPI matches screen scale and roughly halves the pixels that go through PNG and base64 encoding.
+CHART_DPI = 72
+MARKET_CAP_FIGSIZE = (8, 6)
+PRICE_CHANGE_FIGSIZE = (10, 6)
+
+# Rendered charts are kept as base64 files, each prefixed with the digest of the data it was drawn from.
+CHART_CACHE_DIR = ".chart_cache"
+CHART_CACHE_FILES = ("market_cap_chart.b64", "price_change_chart.b64")
+# Bump whenever the chart drawing code changes so cached images from the old code are not served.
+CHART_CACHE_VERSION = 1
+
+async def _fetch(session, params):
+    """Fetch one /coins/markets query."""
+    url = f"{COINGECKO_API_URL}/coins/markets"
+    async with session.get(url, params=params) as response:
+        response.raise_for_status()
+        body = await response.read()
     try:
-        endpoint = f"{COINGECKO_API_URL}/coins/markets"
-        params = {
-            "vs_currency": "usd",
-            "order": "market_cap_desc",
-            "per_page": 50,
-            "page": 1,
-            "sparkline": False,
-            "price_change_percentage": "24h"
-        }
-        
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()  
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # A 200 error page (rate limit, proxy) was cached like any response; evict it so the next run refetches.
+        await session.cache.delete_url(url, params=params)
+        raise
+
+async def fetch_all(param_sets):
+    """Fetch all queries concurrently over one pooled session, returning results in order."""
+    try:
+        cache = SQLiteBackend(HTTP_CACHE_NAME, expire_after=HTTP_CACHE_TTL)
+        async with CachedSession(cache=cache, connector=aiohttp.TCPConnector(limit=20), headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT) as session:
+            return await asyncio.gather(*(_fetch(session, params) for params in param_sets))
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
         print(f"Error fetching data from CoinGecko API: {e}")
         return None
 
+def fetch_top_50_cryptos():
+    """Fetch the top 50 cryptocurrencies by market capitalization from CoinGecko API."""
+    params = {
+        "vs_currency": "usd",
+        "order": "market_cap_desc",
+        "per_page": 50,
+        "page": 1,
+        "sparkline": "false",
+        "price_change_percentage": "24h"
+    }
+    
+    results = asyncio.run(fetch_all([params]))
+    return results[0] if results else None
+
 def process_crypto_data(data):
-    """Process and transform the raw cryptocurrency data."""
+    """Process the raw cryptocurrency data into name/symbol lists and float64 columns."""
     if not data:
         return None
     
-  
-    processed_data = []
-    for coin in data:
-        processed_data.append({
-            "Name": coin["name"],
-            "Symbol": coin["symbol"].upper(),
-            "Current Price (USD)": coin["current_price"],
-            "Market Cap (USD)": coin["market_cap"],
-            "24h Trading Volume (USD)": coin["total_volume"],
-            "24h Price Change (%)": coin["price_change_percentage_24h"] if coin["price_change_percentage_24h"] else 0
-        })
-    
-    return processed_data
+    # Columns are built straight from the JSON, skipping the intermediate dict per coin.
+    n = len(data)
+    return {
+        "names": [coin["name"] for coin in data],
+        "symbols": [coin["symbol"].upper() for coin in data],
+        "price": np.fromiter((coin["current_price"] for coin in data), dtype=np.float64, count=n),
+        "market_cap": np.fromiter((coin["market_cap"] for coin in data), dtype=np.float64, count=n),
+        "volume": np.fromiter((coin["total_volume"] for coin in data), dtype=np.float64, count=n),
+        "change": np.fromiter((coin["price_change_percentage_24h"] or 0.0 for coin in data), dtype=np.float64, count=n)
+    }
+
+def top_k(values, k=5):
+    """Indices of the k largest values, largest first, using a partial sort instead of a full one."""
+    k = min(k, len(values))
+    idx = np.argpartition(values, -k)[-k:]
+    return idx[np.argsort(-values[idx], kind="stable")].tolist()
 
 def analyze_crypto_data(data):
     """Perform analysis on the cryptocurrency data."""
     if not data:
         return None
     
-    df = pd.DataFrame(data)
+    names = data["names"]
+    price = data["price"]
+    market_cap = data["market_cap"]
+    volume = data["volume"]
+    change = data["change"]
+    
+    total_market_cap = market_cap.sum()
+    
+    top_market_cap = top_k(market_cap)
+    gainers = top_k(change)
+    losers = top_k(-change)
     
-   
     analysis = {
-        "top_5_by_market_cap": df.nlargest(5, "Market Cap (USD)")[["Name", "Symbol", "Market Cap (USD)", "Current Price (USD)"]].to_dict("records"),
-        "top_5_by_volume": df.nlargest(5, "24h Trading Volume (USD)")[["Name", "Symbol", "24h Trading Volume (USD)"]].to_dict("records"),
-        "top_5_gainers": df.nlargest(5, "24h Price Change (%)")[["Name", "Symbol", "24h Price Change (%)"]].to_dict("records"),
-        "top_5_losers": df.nsmallest(5, "24h Price Change (%)")[["Name", "Symbol", "24h Price Change (%)"]].to_dict("records"),
-        "average_price": df["Current Price (USD)"].mean(),
-        "median_price": df["Current Price (USD)"].median(),
-        "highest_price_change": df.loc[df["24h Price Change (%)"].idxmax()],
-        "lowest_price_change": df.loc[df["24h Price Change (%)"].idxmin()],
-        "total_market_cap": df["Market Cap (USD)"].sum(),
-        "total_trading_volume": df["24h Trading Volume (USD)"].sum(),
-        "bitcoin_dominance": (df.loc[df["Name"] == "Bitcoin", "Market Cap (USD)"].values[0] / df["Market Cap (USD)"].sum()) * 100 if "Bitcoin" in df["Name"].values else 0,
+        # The report slices data's columns by these indices; no per-coin record dicts are built.
+        "top_5_indices": {"market_cap": top_market_cap, "gainers": gainers, "losers": losers},
+        "average_price": price.mean(),
+        "median_price": np.median(price),
+        "total_market_cap": total_market_cap,
+        "total_trading_volume": volume.sum(),
+        "bitcoin_dominance": market_cap[names.index("Bitcoin")] / total_market_cap * 100 if "Bitcoin" in names else 0,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "data": df
+        "data": data
     }
     
     return analysis
 
-def create_market_cap_chart(analysis):
-    """Create a pie chart of market cap distribution for top 5 cryptocurrencies."""
-    plt.figure(figsize=(8, 6))
-    
-   
-    top5 = analysis["top_5_by_market_cap"]
-    
+@lru_cache(maxsize=1)
+def _chart_figures():
+    """Create the (figure, axes) pairs the two charts reuse, importing pyplot only when a chart is drawn."""
+    import matplotlib
+    matplotlib.use("Agg")  # render straight to memory, no GUI toolkit
+    import matplotlib.pyplot as plt
+    
+    return plt.subplots(figsize=MARKET_CAP_FIGSIZE, dpi=CHART_DPI), plt.subplots(figsize=PRICE_CHANGE_FIGSIZE, dpi=CHART_DPI)
+
+def render_png(fig):
+    """Draw a figure on its Agg canvas and encode the RGBA buffer as PNG with Pillow."""
+    fig.canvas.draw()
+    width, height = fig.canvas.get_width_height(physical=True)
     
-    top5_sum = sum(coin["Market Cap (USD)"] for coin in top5)
-    others = analysis["total_market_cap"] - top5_sum
+    # buffer_rgba() is a zero-copy view; fast zlib level keeps PNG encoding cheap.
+    buffer = BytesIO()
+    Image.frombuffer('RGBA', (width, height), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).save(buffer, 'PNG', compress_level=1)
+    return buffer.getvalue()
+
+def create_market_cap_chart(symbols, market_caps, others):
+    """Create a pie chart of market cap distribution for top 5 cryptocurrencies."""
+    fig, ax = _chart_figures()[0]
+    ax.clear()
     
     
-    labels = [f"{coin['Symbol']} (${coin['Market Cap (USD)'] / 1e9:.2f}B)" for coin in top5]
+    sizes = market_caps.tolist()
+    labels = [f"{symbol} (${size / 1e9:.2f}B)" for symbol, size in zip(symbols, sizes)]
     labels.append(f"Others (${others / 1e9:.2f}B)")
-    
-    sizes = [coin["Market Cap (USD)"] for coin in top5]
     sizes.append(others)
     
     
-    plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, shadow=False)
-    plt.axis('equal')
-    plt.title('Market Cap Distribution (in Billions USD)')
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, shadow=False)
+    ax.axis('equal')
+    ax.set_title('Market Cap Distribution (in Billions USD)')
     
     
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    plt.close()
+    image_png = render_png(fig)
     
+    return pybase64.b64encode(image_png)
 
-    buffer.seek(0)
-    image_png = buffer.getvalue()
-    buffer.close()
-    
-    encoded = base64.b64encode(image_png).decode('utf-8')
-    return encoded
-
-def create_price_change_chart(analysis):
+def create_price_change_chart(symbols, changes):
     """Create a bar chart of top 5 gainers and losers."""
-    plt.figure(figsize=(10, 6))
-    
+    fig, ax = _chart_figures()[1]
+    ax.clear()
     
-    gainers = analysis["top_5_gainers"]
-    losers = analysis["top_5_losers"]
     
-    
-    labels = [coin["Symbol"] for coin in gainers] + [coin["Symbol"] for coin in losers]
-    values = [coin["24h Price Change (%)"] for coin in gainers] + [coin["24h Price Change (%)"] for coin in losers]
+    values = changes.tolist()
     colors = ['green' if val >= 0 else 'red' for val in values]
     
     
-    plt.bar(range(len(values)), values, tick_label=labels, color=colors)
-    plt.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-    plt.title('Top 5 Gainers and Losers (24h Price Change %)')
-    plt.ylabel('Price Change (%)')
-    plt.xticks(rotation=45)
-    
+    bars = ax.bar(range(len(values)), values, tick_label=symbols, color=colors)
+    ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+    ax.set_title('Top 5 Gainers and Losers (24h Price Change %)')
+    ax.set_ylabel('Price Change (%)')
+    ax.tick_params(axis='x', labelrotation=45)
     
-    for i, v in enumerate(values):
-        plt.text(i, v + (1 if v >= 0 else -1), f"{v:.2f}%", ha='center', va='bottom' if v >= 0 else 'top')
     
-    plt.tight_layout()
+    # bar_label places each label just past the bar end, above gainers and below losers.
+    ax.bar_label(bars, labels=[f"{v:.2f}%" for v in values], padding=2)
     
-   
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    plt.close()
+    fig.tight_layout()
     
     
-    buffer.seek(0)
-    image_png = buffer.getvalue()
-    buffer.close()
+    image_png = render_png(fig)
     
-    encoded = base64.b64encode(image_png).decode('utf-8')
-    return encoded
+    return pybase64.b64encode(image_png)
 
-def generate_html_report(analysis):
-    """Generate an HTML report that can be opened in Word."""
-    if not analysis:
-        return False
-    
-    
-    market_cap_chart = create_market_cap_chart(analysis)
-    price_change_chart = create_price_change_chart(analysis)
-    
-   
-    formatted_market_cap = "${:,.2f}".format(analysis["total_market_cap"])
-    formatted_volume = "${:,.2f}".format(analysis["total_trading_volume"])
-    formatted_avg_price = "${:,.2f}".format(analysis["average_price"])
-    formatted_median_price = "${:,.2f}".format(analysis["median_price"])
-    
-    
-    html_content = f"""
+def load_cached_charts(key):
+    """Return the cached (market cap, price change) chart base64 if it was rendered for key, else None."""
+    charts = []
+    for name in CHART_CACHE_FILES:
+        try:
+            with open(os.path.join(CHART_CACHE_DIR, name), "rb") as f:
+                cached_key, _, chart = f.read().partition(b"\n")
+        except OSError:
+            return None
+        if cached_key != key:
+            return None
+        charts.append(chart)
+    return tuple(charts)
+
+def store_cached_charts(key, charts):
+    """Save the rendered charts' base64 under key for the next run."""
+    try:
+        os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+        for name, chart in zip(CHART_CACHE_FILES, charts):
+            # Write aside and swap in, so an interrupted run never leaves a valid key over a truncated image.
+            path = os.path.join(CHART_CACHE_DIR, name)
+            with open(path + ".tmp", "wb") as f:
+                f.write(key + b"\n")
+                f.write(chart)
+            os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"Error writing chart cache: {e}")
+
+# Static report markup is held in module constants; only the overview and table rows are formatted per run.
+# Row templates take the rank, name and symbol followed by the row's preformatted value strings.
+_HTML_HEAD = b"""
     <!DOCTYPE html>
     <html>
     <head>
         <title>Cryptocurrency Market Analysis Report</title>
         <style>
-            body {{ font-family: 'Calibri', Arial, sans-serif; margin: 20px; }}
-            h1, h2, h3 {{ color: #2F5597; }}
-            table {{ border-collapse: collapse; width: 100%; margin-top: 10px; margin-bottom: 20px; }}
-            th, td {{ border: 1px solid #DDDDDD; text-align: left; padding: 8px; }}
-            th {{ background-color: #2F5597; color: white; }}
-            tr:nth-child(even) {{ background-color: #F2F2F2; }}
-            .container {{ margin-bottom: 30px; }}
-            .chart {{ text-align: center; margin: 20px 0; }}
-            .positive {{ color: green; }}
-            .negative {{ color: red; }}
-            .timestamp {{ font-style: italic; color: #666666; text-align: right; }}
+            body { font-family: 'Calibri', Arial, sans-serif; margin: 20px; }
+            h1, h2, h3 { color: #2F5597; }
+            table { border-collapse: collapse; width: 100%; margin-top: 10px; margin-bottom: 20px; }
+            th, td { border: 1px solid #DDDDDD; text-align: left; padding: 8px; }
+            th { background-color: #2F5597; color: white; }
+            tr:nth-child(even) { background-color: #F2F2F2; }
+            .container { margin-bottom: 30px; }
+            .chart { text-align: center; margin: 20px 0; }
+            .positive { color: green; }
+            .negative { color: red; }
+            .timestamp { font-style: italic; color: #666666; text-align: right; }
         </style>
     </head>
-    <body>
+    <body>"""
+
+_OVERVIEW_TMPL = """
         <h1>Cryptocurrency Market Analysis Report</h1>
-        <p class="timestamp">Generated on: {analysis["timestamp"]}</p>
+        <p class="timestamp">Generated on: {timestamp}</p>
         
         <div class="container">
             <h2>Market Overview</h2>
@@ -199,30 +256,32 @@ def generate_html_report(analysis):
                 </tr>
                 <tr>
                     <td>Total Market Cap of Top 50</td>
-                    <td>{formatted_market_cap}</td>
+                    <td>${total_market_cap:,.2f}</td>
                 </tr>
                 <tr>
                     <td>Total 24h Trading Volume</td>
-                    <td>{formatted_volume}</td>
+                    <td>${total_trading_volume:,.2f}</td>
                 </tr>
                 <tr>
                     <td>Average Price of Top 50</td>
-                    <td>{formatted_avg_price}</td>
+                    <td>${average_price:,.2f}</td>
                 </tr>
                 <tr>
                     <td>Median Price of Top 50</td>
-                    <td>{formatted_median_price}</td>
+                    <td>${median_price:,.2f}</td>
                 </tr>
                 <tr>
                     <td>Bitcoin Dominance</td>
-                    <td>{analysis["bitcoin_dominance"]:.2f}%</td>
+                    <td>{bitcoin_dominance:.2f}%</td>
                 </tr>
             </table>
         </div>
         
         <div class="chart">
             <h2>Market Cap Distribution</h2>
-            <img src="data:image/png;base64,{market_cap_chart}" alt="Market Cap Distribution" />
+            <img src="data:image/png;base64,"""
+
+_MCAP_TABLE_HEAD = b"""" alt="Market Cap Distribution" />
         </div>
         
         <div class="container">
@@ -236,26 +295,26 @@ def generate_html_report(analysis):
                     <th>Current Price (USD)</th>
                 </tr>
     """
-    
-    
-    for i, coin in enumerate(analysis["top_5_by_market_cap"], 1):
-        html_content += f"""
+
+_MCAP_ROW_TMPL = """
                 <tr>
-                    <td>{i}</td>
-                    <td>{coin["Name"]}</td>
-                    <td>{coin["Symbol"]}</td>
-                    <td>${coin["Market Cap (USD)"]:,.2f}</td>
-                    <td>${coin["Current Price (USD)"]:.6f}</td>
+                    <td>{0}</td>
+                    <td>{1}</td>
+                    <td>{2}</td>
+                    <td>{3}</td>
+                    <td>{4}</td>
                 </tr>
         """
-    
-    html_content += """
+
+_PRICE_CHART_HEAD = b"""
             </table>
         </div>
         
         <div class="chart">
             <h2>24-Hour Price Change: Top Gainers and Losers</h2>
-            <img src="data:image/png;base64,""" + price_change_chart + """" alt="Price Change Chart" />
+            <img src="data:image/png;base64,"""
+
+_GAINERS_TABLE_HEAD = b"""" alt="Price Change Chart" />
         </div>
         
         <div class="container">
@@ -268,19 +327,17 @@ def generate_html_report(analysis):
                     <th>24h Price Change (%)</th>
                 </tr>
     """
-    
-    
-    for i, coin in enumerate(analysis["top_5_gainers"], 1):
-        html_content += f"""
+
+_GAINER_ROW_TMPL = """
                 <tr>
-                    <td>{i}</td>
-                    <td>{coin["Name"]}</td>
-                    <td>{coin["Symbol"]}</td>
-                    <td class="positive">+{coin["24h Price Change (%)"]:.2f}%</td>
+                    <td>{0}</td>
+                    <td>{1}</td>
+                    <td>{2}</td>
+                    <td class="positive">{3}</td>
                 </tr>
         """
-    
-    html_content += """
+
+_LOSERS_TABLE_HEAD = b"""
             </table>
         </div>
         
@@ -294,19 +351,17 @@ def generate_html_report(analysis):
                     <th>24h Price Change (%)</th>
                 </tr>
     """
-    
-    
-    for i, coin in enumerate(analysis["top_5_losers"], 1):
-        html_content += f"""
+
+_LOSER_ROW_TMPL = """
                 <tr>
-                    <td>{i}</td>
-                    <td>{coin["Name"]}</td>
-                    <td>{coin["Symbol"]}</td>
-                    <td class="negative">{coin["24h Price Change (%)"]:.2f}%</td>
+                    <td>{0}</td>
+                    <td>{1}</td>
+                    <td>{2}</td>
+                    <td class="negative">{3}</td>
                 </tr>
         """
-    
-    html_content += """
+
+_HTML_FOOT = b"""
             </table>
         </div>
         
@@ -331,10 +386,83 @@ def generate_html_report(analysis):
     </body>
     </html>
     """
+
+def _render_rows(template, data, indices, *columns):
+    """Format one table row per coin index from a pre-built template and preformatted value columns."""
+    names = data["names"]
+    symbols = data["symbols"]
+    return "".join(
+        template.format(rank, names[i], symbols[i], *values)
+        for rank, i, *values in zip(count(1), indices, *columns)
+    ).encode("utf-8")
+
+def _html_sections(analysis, market_cap_chart, price_change_chart):
+    """Yield the HTML report one UTF-8 encoded section at a time."""
+    data = analysis["data"]
+    top_market_cap = analysis["top_5_indices"]["market_cap"]
+    gainers = analysis["top_5_indices"]["gainers"]
+    losers = analysis["top_5_indices"]["losers"]
+    
+    # Each numeric column is converted with one tolist() and formatted in one pass.
+    market_caps = ["${:,.2f}".format(value) for value in data["market_cap"][top_market_cap].tolist()]
+    prices = ["${:.6f}".format(value) for value in data["price"][top_market_cap].tolist()]
+    gains = ["+{:.2f}%".format(value) for value in data["change"][gainers].tolist()]
+    losses = ["{:.2f}%".format(value) for value in data["change"][losers].tolist()]
+    
+    yield _HTML_HEAD
+    yield _OVERVIEW_TMPL.format_map(analysis).encode("utf-8")
+    yield market_cap_chart
+    yield _MCAP_TABLE_HEAD
+    yield _render_rows(_MCAP_ROW_TMPL, data, top_market_cap, market_caps, prices)
+    yield _PRICE_CHART_HEAD
+    yield price_change_chart
+    yield _GAINERS_TABLE_HEAD
+    yield _render_rows(_GAINER_ROW_TMPL, data, gainers, gains)
+    yield _LOSERS_TABLE_HEAD
+    yield _render_rows(_LOSER_ROW_TMPL, data, losers, losses)
+    yield _HTML_FOOT
+
+def generate_html_report(analysis):
+    """Generate an HTML report that can be opened in Word."""
+    if not analysis:
+        return False
     
     
-    with open(REPORT_FILE_PATH, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    # Charts take the columns sliced by the analysis' top-5 indices rather than the per-coin records.
+    data = analysis["data"]
+    indices = analysis["top_5_indices"]
+    top_market_cap = indices["market_cap"]
+    movers = indices["gainers"] + indices["losers"]
+    
+    top_symbols = [data["symbols"][i] for i in top_market_cap]
+    top_market_caps = data["market_cap"][top_market_cap]
+    others = float(analysis["total_market_cap"] - top_market_caps.sum())
+    mover_symbols = [data["symbols"][i] for i in movers]
+    mover_changes = data["change"][movers]
+    
+    # Unchanged chart inputs reuse the cached base64 and skip matplotlib entirely.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((CHART_CACHE_VERSION, CHART_DPI, MARKET_CAP_FIGSIZE, PRICE_CHANGE_FIGSIZE)).encode("ascii"))
+    digest.update(top_market_caps.tobytes())
+    digest.update(np.float64(others).tobytes())
+    digest.update(mover_changes.tobytes())
+    digest.update("\0".join(top_symbols + mover_symbols).encode("utf-8"))
+    key = digest.hexdigest().encode("ascii")
+    
+    charts = load_cached_charts(key)
+    if charts is None:
+        charts = (
+            create_market_cap_chart(top_symbols, top_market_caps, others),
+            create_price_change_chart(mover_symbols, mover_changes)
+        )
+        store_cached_charts(key, charts)
+    market_cap_chart, price_change_chart = charts
+    
+    # Write each section as it is produced instead of holding the whole document in memory;
+    # sections are already bytes, so the chart base64 is never decoded and re-encoded.
+    with open(REPORT_FILE_PATH, "wb", buffering=1 << 16) as f:
+        for section in _html_sections(analysis, market_cap_chart, price_change_chart):
+            f.write(section)
     
     print(f"HTML report generated at {REPORT_FILE_PATH}")
     return True